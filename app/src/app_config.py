@@ -4,6 +4,7 @@ from functools import cached_property
 import chromadb
 from chromadb.api import ClientAPI
 from haystack_integrations.document_stores.chroma import ChromaDocumentStore
+from pydantic import Field
 
 from src.adapters import db
 from src.util.env_config import PydanticBaseEnvConfig
@@ -22,6 +23,8 @@ class AppConfig(PydanticBaseEnvConfig):
 
     phoenix_collector_endpoint: str = "https://phoenix:6006"
     batch_otel: bool = True
+    # Fraction of traces to record and send to Phoenix; the rest only incur no-op span overhead
+    phoenix_trace_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
 
     redact_pii: bool = True
 
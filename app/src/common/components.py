@@ -9,8 +9,11 @@ This means that pipeline component instances are used by different threads,
 so the components must be thread-safe.
 """
 
+import asyncio
+import functools
 import json
 import logging
+import weakref
 from json import JSONDecodeError
 from pprint import pformat
 from typing import Any, Callable, List, Optional, TypeVar
@@ -20,12 +23,13 @@ from haystack import component
 from haystack.core.component.types import Variadic
 from haystack.dataclasses.byte_stream import ByteStream
 from haystack.dataclasses.chat_message import ChatMessage
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from pydantic import BaseModel, ValidationError
 
 from src.app_config import config
 from src.common.send_email import send_email
 from src.db.models.support_listing import LlmResponse, Support
+from src.util.cache_util import TtlCache
 
 logger = logging.getLogger(__name__)
 
@@ -64,14 +68,30 @@ class UploadFilesToByteStreams:
         }
 
 
+# Support listings only change when ingestion jobs run, so reuse them across requests for a few minutes
+supports_cache: TtlCache[list[str]] = TtlCache(maxsize=1, ttl_seconds=300)
+
+
 @component
 class LoadSupports:
     """Loads support listings from the database and returns them as formatted strings."""
 
     @component.output_types(supports=list[str])
     def run(self) -> dict:
+        supports = self.cached_supports()
+        if supports is None:
+            supports = self.load_supports()
+            supports_cache.set("supports", supports)
+        return {"supports": supports}
+
+    @staticmethod
+    def cached_supports() -> Optional[list[str]]:
+        """Returns the supports loaded by a recent run(), if any."""
+        return supports_cache.get("supports")
+
+    def load_supports(self) -> list[str]:
         with config.db_session() as db_session, db_session.begin():
-            supports = [
+            return [
                 (
                     f"Name: {support.name}\n"
                     f"- Description: {support.description}\n"
@@ -80,9 +100,10 @@ class LoadSupports:
                     f"- Website: {support.website}\n"
                     f"- Email Addresses: {', '.join(support.email_addresses)}\n"
                 )
-                for support in db_session.query(Support).all()
+                # Keep a consistent order so the prompt prefix is identical across requests,
+                # which lets OpenAI reuse its prompt cache
+                for support in db_session.query(Support).order_by(Support.name, Support.id).all()
             ]
-            return {"supports": supports}
 
 
 @component
@@ -147,6 +168,27 @@ class LoadResult:
         return {"result_json": json_dict}
 
 
+# Share the client so that HTTP connections to the OpenAI API are reused across requests
+@functools.cache
+def _openai_client() -> OpenAI:
+    return OpenAI()
+
+
+# AsyncOpenAI clients hold an httpx connection pool that is bound to the event loop it was first used in,
+# so keep one client per event loop to reuse connections across requests
+_async_openai_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, AsyncOpenAI
+] = weakref.WeakKeyDictionary()
+
+
+def _async_openai_client() -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    client = _async_openai_clients.get(loop)
+    if client is None:
+        client = _async_openai_clients[loop] = AsyncOpenAI()
+    return client
+
+
 @component
 class OpenAIWebSearchGenerator:
     """Searches the web using OpenAI's web search capabilities and generates a response."""
@@ -169,7 +211,39 @@ class OpenAIWebSearchGenerator:
         Returns:
             Dictionary with response key containing string of response
         """
+        api_params = self._api_params(messages, domain, model, reasoning_effort)
+
+        response = _openai_client().responses.create(**api_params)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", pformat(response.output_text, width=160))
+
+        return {"replies": [ChatMessage.from_assistant(response.output_text)]}
+
+    @component.output_types(replies=List[ChatMessage])
+    async def run_async(
+        self,
+        messages: list[ChatMessage],
+        domain: str | None = None,
+        model: str = "gpt-5",
+        reasoning_effort: str = "high",
+    ) -> dict:
+        """
+        Same as run() but awaits the OpenAI API call so that the event loop
+        can serve other requests while waiting for the LLM to respond.
+        """
+        api_params = self._api_params(messages, domain, model, reasoning_effort)
+
+        response = await _async_openai_client().responses.create(**api_params)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", pformat(response.output_text, width=160))
+
+        return {"replies": [ChatMessage.from_assistant(response.output_text)]}
 
+    def _api_params(
+        self, messages: list[ChatMessage], domain: str | None, model: str, reasoning_effort: str
+    ) -> dict:
         logger.info(
             "Calling OpenAI API with web_search, model=%s, domain=%s, reasoning_effort=%s",
             model,
@@ -177,9 +251,17 @@ class OpenAIWebSearchGenerator:
             reasoning_effort,
         )
 
-        assert len(messages) == 1
-        prompt = messages[0].text
-        logger.debug("Prompt: %s", pformat(prompt, width=160))
+        assert messages, "Expected at least one message"
+        prompt: str | list[dict]
+        if len(messages) == 1:
+            prompt = messages[0].text or ""
+        else:
+            # Keep messages separate so that static instructions (e.g., a system message placed first)
+            # form a stable prefix, which OpenAI caches across requests to reduce latency and cost
+            prompt = [{"role": msg.role.value, "content": msg.text} for msg in messages]
+        # Prompts are large, so skip pformat() unless the message will be logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Prompt: %s", pformat(prompt, width=160))
 
         api_params: dict = {
             "model": model,
@@ -190,13 +272,7 @@ class OpenAIWebSearchGenerator:
 
         if domain:
             api_params["tools"][0]["filters"] = {"allowed_domains": [domain]}
-
-        client = OpenAI()
-        response = client.responses.create(**api_params)
-
-        logger.debug("Response: %s", pformat(response.output_text, width=160))
-
-        return {"replies": [ChatMessage.from_assistant(response.output_text)]}
+        return api_params
 
 
 EMAIL_INTRO = """\
@@ -218,7 +294,8 @@ class EmailResult:
     @component.output_types(status=str, email=str, message=str)
     def run(self, email: str, json_dict: dict) -> dict:
         logger.info("Emailing result to %s", email)
-        logger.debug("JSON content:\n%s", json.dumps(json_dict, indent=2))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("JSON content:\n%s", json.dumps(json_dict, indent=2))
         formatted_resources = self.format_resources(json_dict.get("resources", []))
         message = f"{EMAIL_INTRO}\n{formatted_resources}"
 
@@ -252,12 +329,22 @@ BaseModelT = TypeVar("BaseModelT", bound=BaseModel)
 # TODO: Replace with https://docs.haystack.deepset.ai/docs/jsonschemavalidator
 @component
 class LlmOutputValidator:
+    """
+    Validates the LLM reply against pydantic_model.
+
+    A valid reply is output as valid_replies, and the validated model instance as validated_output.
+    Leave validated_output unconnected so that it is included in the pipeline result.
+    An invalid reply is output as invalid_replies with an error_message, which can be connected
+    back to the prompt builder to retry.
+    """
+
     def __init__(self, pydantic_model: type[BaseModelT]):
         # Note that components must be thread-safe, so do not maintain state across runs
         self.pydantic_model = pydantic_model
 
     @component.output_types(
         valid_replies=List[ChatMessage],
+        validated_output=BaseModel,
         invalid_replies=Optional[List[ChatMessage]],
         error_message=Optional[str],
     )
@@ -267,9 +354,9 @@ class LlmOutputValidator:
 
         try:
             assert reply.text is not None, "Reply text is None"
-            output_dict = json.loads(reply.text)
-            self.pydantic_model.model_validate(output_dict)
-            return {"valid_replies": replies}
+            # Parse and validate in a single pass with pydantic-core rather than json.loads() first
+            validated_output = self.pydantic_model.model_validate_json(reply.text)
+            return {"valid_replies": replies, "validated_output": validated_output}
 
         except (ValueError, ValidationError) as e:
             logger.error(
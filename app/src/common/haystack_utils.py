@@ -1,9 +1,11 @@
-from typing import Sequence
+import asyncio
+from typing import Any, Awaitable, Callable, Sequence
 
 from haystack.dataclasses.chat_message import ChatMessage
 from phoenix.client.__generated__ import v1
 
 from src.common import phoenix_utils
+from src.util.cache_util import TtlCache
 
 
 def get_phoenix_prompt(prompt_name: str, prompt_version_id: str = "") -> list[ChatMessage]:
@@ -11,6 +13,39 @@ def get_phoenix_prompt(prompt_name: str, prompt_version_id: str = "") -> list[Ch
     return to_chat_messages(prompt_ver._template["messages"])
 
 
+# Avoid an HTTP round trip to Phoenix on every request; a short TTL still picks up new prompt versions
+phoenix_prompt_cache: TtlCache[list[ChatMessage]] = TtlCache(maxsize=32, ttl_seconds=60)
+
+
+def get_cached_phoenix_prompt(prompt_name: str, prompt_version_id: str = "") -> list[ChatMessage]:
+    "Same as get_phoenix_prompt() but reuses recently retrieved prompts. Failed lookups are not cached."
+    cache_key = (prompt_name, prompt_version_id)
+    prompt = phoenix_prompt_cache.get(cache_key)
+    if prompt is None:
+        prompt = get_phoenix_prompt(prompt_name, prompt_version_id)
+        phoenix_prompt_cache.set(cache_key, prompt)
+    return prompt
+
+
+# Limit how many pipeline runs run_concurrently() starts at once, to stay within OpenAI rate limits
+MAX_CONCURRENT_RUNS = 10
+
+
+async def run_concurrently(
+    run_async: Callable[..., Awaitable[Any]],
+    kwargs_list: Sequence[dict],
+    max_concurrency: int = MAX_CONCURRENT_RUNS,
+) -> list[Any]:
+    """Await run_async(**kwargs) for each kwargs in kwargs_list; results are in the same order."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_one(kwargs: dict) -> Any:
+        async with semaphore:
+            return await run_async(**kwargs)
+
+    return await asyncio.gather(*(run_one(kwargs) for kwargs in kwargs_list))
+
+
 def to_chat_messages(
     msg_list: Sequence[dict | v1.PromptMessage | ChatMessage],
 ) -> list[ChatMessage]:
@@ -5,7 +5,8 @@ from pprint import pformat
 import httpx
 import opentelemetry.exporter.otlp.proto.http.trace_exporter as otel_trace_exporter
 import phoenix.otel
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
 from opentelemetry.trace import NoOpTracerProvider, TracerProvider
 
 # https://docs.arize.com/phoenix/tracing/integrations-tracing/haystack
@@ -14,7 +15,7 @@ from phoenix.client import Client
 from phoenix.client.types import PromptVersion
 
 from src.app_config import config
-from src.logging.presidio_pii_filter import PresidioRedactionSpanProcessor
+from src.logging.presidio_pii_filter import PresidioRedactionSpanExporter
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,11 @@ def configure_phoenix(only_if_alive: bool = True) -> None:
     logger.info("Using Phoenix OTEL endpoint: %s", trace_endpoint)
 
     # Using Phoenix docs: https://arize.com/docs/phoenix/tracing/integrations-tracing/haystack
-    logger.info("Using phoenix.otel.register with batch_otel=%s", config.batch_otel)
+    logger.info(
+        "Using phoenix.otel.register with batch_otel=%s, phoenix_trace_sample_rate=%s",
+        config.batch_otel,
+        config.phoenix_trace_sample_rate,
+    )
     # This uses PHOENIX_COLLECTOR_ENDPOINT and PHOENIX_PROJECT_NAME env variables
     # and PHOENIX_API_KEY to handle authentication to Phoenix.
     global tracer_provider
@@ -64,6 +69,9 @@ def configure_phoenix(only_if_alive: bool = True) -> None:
         batch=config.batch_otel,
         # Auto-instrument based on installed OpenInference dependencies
         auto_instrument=True,
+        # Head-based sampling: unsampled requests get non-recording spans, and
+        # child spans (e.g., from auto-instrumentation) follow their parent's decision
+        sampler=ParentBased(TraceIdRatioBased(config.phoenix_trace_sample_rate)),
     )
 
     if config.redact_pii:
@@ -71,12 +79,14 @@ def configure_phoenix(only_if_alive: bool = True) -> None:
         span_exporter = otel_trace_exporter.OTLPSpanExporter(
             endpoint=trace_endpoint, headers={"Authorization": f"Bearer {phoenix_api_key}"}
         )
-        # Create the PII redacting processor with the OTLP exporter
-        pii_processor = PresidioRedactionSpanProcessor(span_exporter)
-        # Add the pii processor to the otel instance
+        # Redact PII from spans before they are sent with the OTLP exporter
+        pii_exporter = PresidioRedactionSpanExporter(span_exporter)
+        # Replaces the default span processor set by phoenix.otel.register()
         if config.batch_otel:
-            tracer_provider.add_span_processor(BatchSpanProcessor(span_exporter))
-        tracer_provider.add_span_processor(pii_processor)
+            # Redact and export in a background thread so requests don't wait on Presidio or Phoenix
+            tracer_provider.add_span_processor(BatchSpanProcessor(pii_exporter))
+        else:
+            tracer_provider.add_span_processor(SimpleSpanProcessor(pii_exporter))
 
 
 def get_prompt_template(prompt_name: str, prompt_version_id: str = "") -> PromptVersion:
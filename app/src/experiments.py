@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import functools
 import json
 import logging
@@ -64,6 +65,8 @@ PIPELINES = {
 }
 pipeline_name = "generate-referrals"
 prompt_version = None
+# Identifies requests made by experiments, e.g., in traces and logs
+user_email = "experiments@example.com"
 
 
 @functools.lru_cache
@@ -86,7 +89,15 @@ def get_question(example: dict) -> str:
 def query_pipeline(example: dict) -> TaskOutput:
     question = get_question(example)
     logger.info("Getting answer for: %r", question)
-    response = create_pipeline().run_api(query=question, prompt_version_id=prompt_version or "")
+    response = asyncio.run(
+        create_pipeline().run_api_async(
+            query=question,
+            user_email=user_email,
+            prompt_version_id=prompt_version or "",
+            # Score newly generated responses rather than cached ones
+            cache=False,
+        )
+    )
     replies = response["llm"]["replies"]
     assert len(replies) == 1, f"Expected exactly one reply but got {len(replies)}"
     return replies[0].to_dict()["content"]
@@ -97,7 +108,12 @@ def query_api(example: dict) -> TaskOutput:
     logger.info("Getting answer for: %r", question)
 
     assert url_base, "DEPLOYED_API_URL is not set -- add it to override.env"
-    json_data = {"query": question, "prompt_version_id": prompt_version or ""}
+    json_data = {
+        "query": question,
+        "user_email": user_email,
+        "prompt_version_id": prompt_version or "",
+        "cache": False,
+    }
     response = requests.post(
         f"{url_base}/{PIPELINES[pipeline_name]['url_path']}",
         headers={
@@ -1,9 +1,9 @@
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from opentelemetry.sdk.trace import Event, ReadableSpan, Span, SpanProcessor
-from opentelemetry.sdk.trace.export import SpanExporter
+from opentelemetry.sdk.trace import Event, ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
 from presidio_analyzer import AnalyzerEngine, recognizer_result
 from presidio_analyzer.nlp_engine import NlpEngineProvider
 from presidio_anonymizer import AnonymizerEngine
@@ -14,9 +14,13 @@ logger = logging.getLogger(__name__)
 email_skip_redaction_list = ["gwctx.org", "navapbc.com", "goodwill.org"]
 
 
-class PresidioRedactionSpanProcessor(SpanProcessor):
+class PresidioRedactionSpanExporter(SpanExporter):
     """
-    OpenTelemetry span processor that redacts PII data using Microsoft Presidio.
+    OpenTelemetry span exporter that redacts PII data using Microsoft Presidio
+    before passing spans to another exporter.
+
+    Wrap it in a BatchSpanProcessor so that redaction and export happen in a
+    background thread rather than while handling a request.
     """
 
     def __init__(
@@ -26,7 +30,7 @@ class PresidioRedactionSpanProcessor(SpanProcessor):
         language: str = "en",
     ):
         """
-        Initialize the PII redacting processor with Presidio and an exporter.
+        Initialize the PII redacting exporter with Presidio and an exporter.
 
         Args:
             exporter: The span exporter to use after PII redaction
@@ -219,20 +223,14 @@ class PresidioRedactionSpanProcessor(SpanProcessor):
 
         return redacted_span
 
-    def on_start(self, span: Span, parent_context: Optional[Any] = None) -> None:
-        """Called when a span starts."""
-        pass
-
-    def on_end(self, span: ReadableSpan) -> None:
-        """Called when a span ends. Creates a redacted copy and exports it."""
-        redacted_span = self._create_redacted_span(span)
-        self._exporter.export([redacted_span])
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Exports redacted copies of the spans."""
+        return self._exporter.export([self._create_redacted_span(span) for span in spans])
 
     def shutdown(self) -> None:
-        """Shuts down the processor and exporter."""
+        """Shuts down the exporter."""
         self._exporter.shutdown()
 
     def force_flush(self, timeout_millis: int = 30000) -> bool:
         """Forces flush of pending spans."""
-        self._exporter.force_flush(timeout_millis)
-        return True
+        return self._exporter.force_flush(timeout_millis)
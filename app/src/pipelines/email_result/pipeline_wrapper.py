@@ -36,8 +36,9 @@ class PipelineWrapper(BasePipelineWrapper):
                 self.name, openinference_span_kind="chain"
             ) as span:
                 result = self._run(result_id, email)
-                span.set_input(result_id)
-                span.set_output(result["email_result"]["status"])
+                if span.is_recording():
+                    span.set_input(result_id)
+                    span.set_output(result["email_result"]["status"])
                 span.set_status(Status(StatusCode.OK))
                 return result
 
@@ -57,7 +58,8 @@ class PipelineWrapper(BasePipelineWrapper):
                 },
                 include_outputs_from={"email_result"},
             )
-            logger.debug("Results: %s", pformat(response, width=160))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Results: %s", pformat(response, width=160))
             return response
         except PipelineRuntimeError as re:
             error_msg = str(re)
@@ -1,16 +1,19 @@
+import functools
+import hashlib
 import logging
 from pprint import pformat
 
 from hayhooks import BasePipelineWrapper
-from haystack import Pipeline
+from haystack import AsyncPipeline
 from haystack.components.builders import ChatPromptBuilder
 from openinference.instrumentation import _tracers, using_attributes, using_metadata
 from opentelemetry.trace.status import Status, StatusCode
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from src.common import haystack_utils, phoenix_utils
 from src.common.components import OpenAIWebSearchGenerator, ReadableLogger
 from src.pipelines.generate_referrals.pipeline_wrapper import Resource
+from src.util.cache_util import TtlCache
 
 logger = logging.getLogger(__name__)
 tracer = phoenix_utils.tracer_provider.get_tracer(__name__)
@@ -30,6 +33,8 @@ action_plan_as_json = """
 }
 """
 
+llm_args = {"model": "gpt-5-mini", "reasoning_effort": "low"}
+
 
 def create_websearch() -> OpenAIWebSearchGenerator:
     return OpenAIWebSearchGenerator()
@@ -39,7 +44,7 @@ class PipelineWrapper(BasePipelineWrapper):
     name = "generate_action_plan"
 
     def setup(self) -> None:
-        pipeline = Pipeline()
+        pipeline = AsyncPipeline()
         pipeline.add_component("llm", create_websearch())
 
         prompt_template = haystack_utils.get_phoenix_prompt("generate_action_plan")
@@ -54,12 +59,21 @@ class PipelineWrapper(BasePipelineWrapper):
 
         pipeline.add_component("logger", ReadableLogger())
         pipeline.connect("llm", "logger")
+        # Warm up components now rather than during the first request
+        pipeline.warm_up()
 
         self.pipeline = pipeline
+        # Retries of the same request (e.g., regenerating an action plan) reuse the earlier LLM response
+        self.response_cache: TtlCache[dict] = TtlCache(maxsize=1024, ttl_seconds=3600)
 
     # Called for the `generate-action-plan/run` endpoint
-    def run_api(
-        self, resources: list[Resource] | list[dict], user_email: str, user_query: str
+    # Hayhooks uses run_api_async() instead of run_api() so the LLM call doesn't block a worker thread
+    async def run_api_async(
+        self,
+        resources: list[Resource] | list[dict],
+        user_email: str,
+        user_query: str,
+        cache: bool = True,
     ) -> dict:
         resource_objects = get_resources(resources)
 
@@ -69,14 +83,31 @@ class PipelineWrapper(BasePipelineWrapper):
             with tracer.start_as_current_span(  # pylint: disable=not-context-manager,unexpected-keyword-arg
                 self.name, openinference_span_kind="chain"
             ) as span:
-                result = self._run(resource_objects, user_email, user_query)
-                span.set_input([r.name for r in resource_objects])
-                span.set_output(result["response"])
+                cache_key = response_cache_key(resource_objects, user_query)
+                result = self.response_cache.get(cache_key) if cache else None
+                span.set_attribute("cache_hit", result is not None)
+                if result is None:
+                    result = await self._run_async(resource_objects, user_email, user_query)
+                    # Don't cache an invalid action plan, so that retrying the request can fix it
+                    if cache and is_valid_action_plan(result["response"]):
+                        self.response_cache.set(cache_key, result)
+                if span.is_recording():
+                    span.set_input(", ".join(r.name for r in resource_objects))
+                    span.set_output(result["response"])
                 span.set_status(Status(StatusCode.OK))
                 return result
 
-    def _run(self, resource_objects: list[Resource], user_email: str, user_query: str) -> dict:
-        response = self.pipeline.run(
+    async def run_api_batch(self, payloads: list[dict]) -> list[dict]:
+        """
+        Generate action plans for several requests concurrently (e.g., for batch evaluation).
+        Each payload holds the keyword arguments for run_api_async(); results are in the same order.
+        """
+        return await haystack_utils.run_concurrently(self.run_api_async, payloads)
+
+    async def _run_async(
+        self, resource_objects: list[Resource], user_email: str, user_query: str
+    ) -> dict:
+        response = await self.pipeline.run_async(
             {
                 "logger": {
                     "messages_list": [
@@ -88,39 +119,83 @@ class PipelineWrapper(BasePipelineWrapper):
                     "action_plan_json": action_plan_as_json,
                     "user_query": user_query,
                 },
-                "llm": {"model": "gpt-5-mini", "reasoning_effort": "low"},
+                "llm": llm_args,
             },
             include_outputs_from={"llm"},
         )
-        logger.debug("Results: %s", pformat(response, width=160))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Results: %s", pformat(response, width=160))
         return {"response": response["llm"]["replies"][0]._content[0].text}
 
 
+def response_cache_key(resource_objects: list[Resource], user_query: str) -> str:
+    """Hash everything that determines the LLM's response (the prompt template is fixed in setup())."""
+    key_parts = [repr(sorted(llm_args.items())), format_resources(resource_objects), user_query]
+    return hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
+
+
+def is_valid_action_plan(response: str) -> bool:
+    try:
+        ActionPlan.model_validate_json(response)
+        return True
+    except ValidationError:
+        return False
+
+
+resource_list_adapter = TypeAdapter(list[Resource])
+
+
 def get_resources(resources: list[Resource] | list[dict]) -> list[Resource]:
     """Ensure we have a list of Resource objects."""
     if not resources:
         return []
     if isinstance(resources[0], Resource):
         return resources  # type: ignore[return-value]
-    return [Resource(**res) for res in resources]  # type: ignore[arg-type]
+    # Validate the whole list in one call to Pydantic's compiled validator
+    return resource_list_adapter.validate_python(resources)
 
 
 def format_resources(resources: list[Resource]) -> str:
     """Format a list of Resource objects into a readable string."""
-    formatted_resources = []
-    for resource in resources:
-        resource_str = f"Name: {resource.name}\n"
-        if resource.description:
-            resource_str += f"- Description: {resource.description}\n"
-        if resource.justification:
-            resource_str += f"- Justification: {resource.justification}\n"
-        if resource.addresses:
-            resource_str += f"- Addresses: {', '.join(resource.addresses)}\n"
-        if resource.phones:
-            resource_str += f"- Phones: {', '.join(resource.phones)}\n"
-        if resource.emails:
-            resource_str += f"- Emails: {', '.join(resource.emails)}\n"
-        if resource.website:
-            resource_str += f"- Website: {resource.website}\n"
-        formatted_resources.append(resource_str)
-    return "\n".join(formatted_resources)
+    return "\n".join(format_resource(resource) for resource in resources)
+
+
+def format_resource(resource: Resource) -> str:
+    return _format_resource_fields(
+        resource.name,
+        resource.description,
+        resource.justification,
+        tuple(resource.addresses),
+        tuple(resource.phones),
+        tuple(resource.emails),
+        resource.website,
+    )
+
+
+# The same resources are often sent repeatedly (e.g., when a user regenerates an action plan),
+# so cache the formatted text keyed by the resource's content
+@functools.lru_cache(maxsize=256)
+def _format_resource_fields(
+    name: str,
+    description: str,
+    justification: str,
+    addresses: tuple[str, ...],
+    phones: tuple[str, ...],
+    emails: tuple[str, ...],
+    website: str | None,
+) -> str:
+    # Collect the lines and join once rather than repeatedly concatenating strings
+    lines = [f"Name: {name}\n"]
+    if description:
+        lines.append(f"- Description: {description}\n")
+    if justification:
+        lines.append(f"- Justification: {justification}\n")
+    if addresses:
+        lines.append(f"- Addresses: {', '.join(addresses)}\n")
+    if phones:
+        lines.append(f"- Phones: {', '.join(phones)}\n")
+    if emails:
+        lines.append(f"- Emails: {', '.join(emails)}\n")
+    if website:
+        lines.append(f"- Website: {website}\n")
+    return "".join(lines)
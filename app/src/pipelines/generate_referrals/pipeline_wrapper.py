@@ -1,21 +1,27 @@
+import asyncio
+import hashlib
 import json
 import logging
+import re
+from contextlib import contextmanager
 from enum import Enum
 from pprint import pformat
-from typing import Optional
+from typing import Iterator, Optional
 
 import httpx
 from fastapi import HTTPException
 from hayhooks import BasePipelineWrapper
-from haystack import Pipeline
+from haystack import AsyncPipeline
 from haystack.components.builders import ChatPromptBuilder
 from haystack.core.errors import PipelineRuntimeError
 from haystack.dataclasses.chat_message import ChatMessage
 from openinference.instrumentation import _tracers, using_attributes, using_metadata
 from opentelemetry.trace.status import Status, StatusCode
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import from_json
 
 from src.common import components, haystack_utils, phoenix_utils
+from src.util.cache_util import TtlCache
 
 logger = logging.getLogger(__name__)
 tracer = phoenix_utils.tracer_provider.get_tracer(__name__)
@@ -28,6 +34,9 @@ class ReferralType(str, Enum):
 
 
 class Resource(BaseModel):
+    # Resources are only read after validation, so make them immutable (and safe to share between requests)
+    model_config = ConfigDict(frozen=True)
+
     name: str
     addresses: list[str]
     phones: list[str]
@@ -39,6 +48,8 @@ class Resource(BaseModel):
 
 
 class ResourceList(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     resources: list[Resource]
 
 
@@ -56,6 +67,12 @@ response_schema = """
     }[];
 }
 """
+# Collapse the indentation since the schema is included in every prompt
+response_schema = re.sub(r"\s+", " ", response_schema).strip()
+
+# The prompt and supports are part of the response cache key,
+# so changes to them take effect before cached responses expire
+RESPONSE_CACHE_TTL_SECONDS = 60 * 60
 
 
 class PipelineWrapper(BasePipelineWrapper):
@@ -63,9 +80,25 @@ class PipelineWrapper(BasePipelineWrapper):
 
     def setup(self) -> None:
         # Do not rely on max_runs_per_component strictly, i.e., a component may run max_runs_per_component+1 times.
-        # The component_visits counter for max_runs_per_component is reset with each call to pipeline.run()
-        pipeline = Pipeline(max_runs_per_component=3)
+        # The component_visits counter for max_runs_per_component is reset with each call to pipeline.run_async()
+        pipeline = AsyncPipeline(max_runs_per_component=3)
         pipeline.add_component("load_supports", components.LoadSupports())
+        self._add_generation_components(pipeline)
+        pipeline.connect("load_supports.supports", "prompt_builder.supports")
+        # Warm up components now rather than during the first request
+        pipeline.warm_up()
+
+        self.pipeline = pipeline
+        # Repeated queries reuse the earlier validated LLM response
+        self.response_cache: TtlCache[tuple[list[ChatMessage], ResourceList]] = TtlCache(
+            maxsize=1024, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS
+        )
+
+    def _add_generation_components(self, pipeline: AsyncPipeline) -> None:
+        """
+        Add the components that generate, validate, and save referrals.
+        Subclasses provide the input to "prompt_builder.supports" from other sources.
+        """
         pipeline.add_component(
             "prompt_builder",
             ChatPromptBuilder(
@@ -84,7 +117,6 @@ class PipelineWrapper(BasePipelineWrapper):
         pipeline.add_component("output_validator", components.LlmOutputValidator(ResourceList))
         pipeline.add_component("save_result", components.SaveResult())
 
-        pipeline.connect("load_supports.supports", "prompt_builder.supports")
         pipeline.connect("prompt_builder", "llm.messages")
         pipeline.connect("llm.replies", "output_validator")
         pipeline.connect("output_validator.valid_replies", "save_result.replies")
@@ -96,31 +128,69 @@ class PipelineWrapper(BasePipelineWrapper):
         pipeline.add_component("logger", components.ReadableLogger())
         pipeline.connect("output_validator.valid_replies", "logger")
 
-        self.pipeline = pipeline
-
     # Called for the `generate-referrals/run` endpoint
-    def run_api(self, query: str, user_email: str, prompt_version_id: str = "") -> dict:
+    # Hayhooks uses run_api_async() instead of run_api() so the LLM call doesn't block a worker thread
+    async def run_api_async(
+        self, query: str, user_email: str, prompt_version_id: str = "", cache: bool = True
+    ) -> dict:
         with using_attributes(user_id=user_email), using_metadata({"user_id": user_email}):
             # Must set using_metadata context before calling tracer.start_as_current_span()
             assert isinstance(tracer, _tracers.OITracer), f"Got unexpected {type(tracer)}"
             with tracer.start_as_current_span(  # pylint: disable=not-context-manager,unexpected-keyword-arg
                 self.name, openinference_span_kind="chain"
             ) as span:
-                result = self._run(query, user_email, prompt_version_id)
-                span.set_input(query)
-                try:
-                    resp_obj = json.loads(result["llm"]["replies"][-1].text)
-                    span.set_output([r["name"] for r in resp_obj["resources"]])
-                except (KeyError, IndexError):
-                    span.set_output(result["llm"]["replies"][-1].text)
+                prompt_template = await self._get_prompt_template(prompt_version_id)
+                cache_key = response_cache_key(
+                    query, prompt_template, await self._supports_fingerprint()
+                )
+                cached = self.response_cache.get(cache_key) if cache else None
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is None:
+                    result = await self._run_async(query, user_email, prompt_template)
+                    # Not part of the API response; validated_output is only used for tracing and caching
+                    validated_output = result.pop("output_validator", {}).get("validated_output")
+                    if cache and isinstance(validated_output, ResourceList):
+                        self.response_cache.set(
+                            cache_key, (result["llm"]["replies"], validated_output)
+                        )
+                else:
+                    replies, validated_output = cached
+                    result = await self._run_cached_async(
+                        query, user_email, prompt_template, replies
+                    )
+                if span.is_recording():
+                    span.set_input(query)
+                    if isinstance(validated_output, ResourceList):
+                        span.set_output([r.name for r in validated_output.resources])
+                    else:
+                        try:
+                            resp_obj = from_json(result["llm"]["replies"][-1].text)
+                            span.set_output([r["name"] for r in resp_obj["resources"]])
+                        except (KeyError, IndexError, ValueError):
+                            span.set_output(result["llm"]["replies"][-1].text)
                 span.set_status(Status(StatusCode.OK))
                 return result
 
-    def _run(self, query: str, user_email: str, prompt_version_id: str = "") -> dict:
+    async def run_api_batch(self, payloads: list[dict]) -> list[dict]:
+        """
+        Generate referrals for several queries concurrently (e.g., for batch evaluation).
+        Each payload holds the keyword arguments for run_api_async(); results are in the same order.
+        """
+        return await haystack_utils.run_concurrently(self.run_api_async, payloads)
+
+    async def _get_prompt_template(self, prompt_version_id: str = "") -> list[ChatMessage]:
+        # Avoid handing off to a thread when the prompt is already cached
+        prompt_template = haystack_utils.phoenix_prompt_cache.get(
+            ("generate_referrals", prompt_version_id)
+        )
+        if prompt_template is not None:
+            return prompt_template
+
         # Retrieve the requested prompt_version_id and error if requested prompt version is not found
         try:
-            prompt_template = haystack_utils.get_phoenix_prompt(
-                "generate_referrals", prompt_version_id
+            # Run in a thread since a cache miss makes a blocking HTTP request to Phoenix
+            return await asyncio.to_thread(
+                haystack_utils.get_cached_phoenix_prompt, "generate_referrals", prompt_version_id
             )
         except httpx.HTTPStatusError as he:
             raise HTTPException(
@@ -128,19 +198,49 @@ class PipelineWrapper(BasePipelineWrapper):
                 detail=f"The requested prompt version '{prompt_version_id}' could not be retrieved due to HTTP status {he.response.status_code}",
             ) from he
 
-        try:
-            response = self.pipeline.run(
+    async def _supports_fingerprint(self) -> str:
+        """Hash the supports included in the prompt so cached responses aren't reused after they change."""
+        supports = components.LoadSupports.cached_supports()
+        if supports is None:
+            # Run in a thread since loading the supports queries the database
+            load_supports = self.pipeline.get_component("load_supports")
+            supports = (await asyncio.to_thread(load_supports.run))["supports"]
+        return hashlib.sha256("\0".join(supports).encode()).hexdigest()
+
+    async def _run_async(
+        self, query: str, user_email: str, prompt_template: list[ChatMessage]
+    ) -> dict:
+        with raise_http_exception_on_error():
+            response = await self.pipeline.run_async(
                 self._run_arg_data(query, user_email, prompt_template),
                 include_outputs_from={"llm", "save_result"},
             )
-            logger.debug("Results: %s", pformat(response, width=160))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Results: %s", pformat(response, width=160))
             return response
-        except PipelineRuntimeError as re:
-            logger.error("PipelineRuntimeError: %s", re, exc_info=True)
-            raise HTTPException(status_code=500, detail=str(re)) from re
-        except Exception as e:
-            logger.error("Error %s: %s", type(e), e, exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}") from e
+
+    async def _run_cached_async(
+        self,
+        query: str,
+        user_email: str,
+        prompt_template: list[ChatMessage],
+        replies: list[ChatMessage],
+    ) -> dict:
+        """
+        Return the same outputs as _run_async() for cached LLM replies without calling the LLM.
+        A new result is saved so that each response has its own result_id, e.g., for emailing the result.
+        """
+        logger_data = self._run_arg_data(query, user_email, prompt_template)["logger"]
+        readable_logger = self.pipeline.get_component("logger")
+        save_result = self.pipeline.get_component("save_result")
+        with raise_http_exception_on_error():
+            return {
+                "llm": {"replies": replies},
+                "logger": readable_logger.run(
+                    messages_list=[logger_data["messages_list"], replies]
+                ),
+                "save_result": await asyncio.to_thread(save_result.run, replies=replies),
+            }
 
     def _run_arg_data(
         self, query: str, user_email: str, prompt_template: list[ChatMessage]
@@ -156,3 +256,31 @@ class PipelineWrapper(BasePipelineWrapper):
             },
             "llm": {"model": "gpt-5-mini", "reasoning_effort": "low"},
         }
+
+
+@contextmanager
+def raise_http_exception_on_error() -> Iterator[None]:
+    """Log errors from generating referrals and respond with HTTP status 500."""
+    try:
+        yield
+    except PipelineRuntimeError as re:
+        logger.error("PipelineRuntimeError: %s", re, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(re)) from re
+    except Exception as e:
+        logger.error("Error %s: %s", type(e), e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}") from e
+
+
+def response_cache_key(
+    query: str, prompt_template: list[ChatMessage], supports_fingerprint: str
+) -> str:
+    """
+    Hash the normalized query with the content of the prompt template and the supports that are used,
+    so that a new version of the prompt or changed supports are used as soon as they are retrieved.
+    """
+    key_parts = [
+        query.strip().lower(),
+        json.dumps([msg.to_dict() for msg in prompt_template]),
+        supports_fingerprint,
+    ]
+    return hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
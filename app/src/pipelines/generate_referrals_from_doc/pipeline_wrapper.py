@@ -1,4 +1,3 @@
-import json
 import logging
 from pprint import pformat
 from typing import List, Optional
@@ -10,6 +9,7 @@ from haystack.components.builders import ChatPromptBuilder
 from haystack.components.converters import OutputAdapter, PyPDFToDocument
 from openinference.instrumentation import _tracers, using_metadata
 from opentelemetry.trace.status import Status, StatusCode
+from pydantic_core import from_json
 
 from src.common import components, haystack_utils, phoenix_utils
 from src.pipelines.generate_referrals.pipeline_wrapper import response_schema
@@ -76,12 +76,13 @@ class PipelineWrapper(BasePipelineWrapper):
                 self.name, openinference_span_kind="chain"
             ) as span:
                 result = self._run(files)
-                span.set_input([file.filename for file in files])
-                try:
-                    resp_obj = json.loads(result["llm"]["replies"][-1].text)
-                    span.set_output([r["name"] for r in resp_obj["resources"]])
-                except (KeyError, IndexError):
-                    span.set_output(result["llm"]["replies"][-1].text)
+                if span.is_recording():
+                    span.set_input([file.filename for file in files])
+                    try:
+                        resp_obj = from_json(result["llm"]["replies"][-1].text)
+                        span.set_output([r["name"] for r in resp_obj["resources"]])
+                    except (KeyError, IndexError, ValueError):
+                        span.set_output(result["llm"]["replies"][-1].text)
                 span.set_status(Status(StatusCode.OK))
                 return result
 
@@ -1,18 +1,18 @@
 import logging
 
-from haystack import Pipeline
-from haystack.components.builders import ChatPromptBuilder
+from haystack import AsyncPipeline
 from haystack.components.converters import OutputAdapter
 from haystack.components.embedders import SentenceTransformersTextEmbedder
 from haystack.dataclasses.chat_message import ChatMessage
 from haystack_integrations.components.retrievers.chroma import ChromaEmbeddingRetriever
 
 from src.app_config import config
-from src.common import components, phoenix_utils
+from src.common import phoenix_utils
+from src.pipelines.generate_referrals.pipeline_wrapper import RESPONSE_CACHE_TTL_SECONDS
 from src.pipelines.generate_referrals.pipeline_wrapper import (
     PipelineWrapper as GenerateReferralsPipelineWrapper,
 )
-from src.pipelines.generate_referrals.pipeline_wrapper import ResourceList
+from src.util.cache_util import TtlCache
 
 logger = logging.getLogger(__name__)
 tracer = phoenix_utils.tracer_provider.get_tracer(__name__)
@@ -22,7 +22,7 @@ class PipelineWrapper(GenerateReferralsPipelineWrapper):
     name = "generate_referrals_rag"
 
     def setup(self) -> None:
-        pipeline = Pipeline(max_runs_per_component=3)
+        pipeline = AsyncPipeline(max_runs_per_component=3)
 
         # Replace LoadSupports() with retrieval from vector DB
         pipeline.add_component(
@@ -44,38 +44,18 @@ class PipelineWrapper(GenerateReferralsPipelineWrapper):
         pipeline.connect("query_embedder.embedding", "retriever.query_embedding")
         pipeline.connect("retriever.documents", "output_adapter")
 
-        pipeline.add_component(
-            "prompt_builder",
-            ChatPromptBuilder(
-                # List all variables (required and optional) that could be used in the prompt template.
-                # Don't include "template" as it is implicitly required by ChatPromptBuilder
-                variables=[
-                    "query",
-                    "supports",
-                    "response_json",
-                    "error_message",
-                    "invalid_replies",
-                ],
-            ),
-        )
-        pipeline.add_component("llm", components.OpenAIWebSearchGenerator())
-        pipeline.add_component("output_validator", components.LlmOutputValidator(ResourceList))
-        pipeline.add_component("save_result", components.SaveResult())
-
+        self._add_generation_components(pipeline)
         pipeline.connect("output_adapter.output", "prompt_builder.supports")
-        pipeline.connect("prompt_builder", "llm.messages")
-        pipeline.connect("llm.replies", "output_validator")
-        pipeline.connect("output_validator.valid_replies", "save_result.replies")
-
-        # Re-trigger the prompt builder with error_message and invalid_replies
-        pipeline.connect("output_validator.error_message", "prompt_builder.error_message")
-        pipeline.connect("output_validator.invalid_replies", "prompt_builder.invalid_replies")
-
-        pipeline.add_component("logger", components.ReadableLogger())
-        pipeline.connect("output_validator.valid_replies", "logger")
+        # Load the embedding model now rather than during the first request
+        pipeline.warm_up()
 
         # pipeline.draw(path="generate_referrals_rag.png")
         self.pipeline = pipeline
+        self.response_cache = TtlCache(maxsize=1024, ttl_seconds=RESPONSE_CACHE_TTL_SECONDS)
+
+    async def _supports_fingerprint(self) -> str:
+        # Supports are retrieved for the query, which is already part of the response cache key
+        return ""
 
     def _run_arg_data(
         self, query: str, user_email: str, prompt_template: list[ChatMessage]
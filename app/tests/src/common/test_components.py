@@ -1,3 +1,4 @@
+import asyncio
 import json
 from io import BytesIO
 from textwrap import dedent
@@ -12,9 +13,11 @@ from src.common.components import (
     LlmOutputValidator,
     LoadResult,
     LoadSupports,
+    OpenAIWebSearchGenerator,
     ReadableLogger,
     SaveResult,
     UploadFilesToByteStreams,
+    supports_cache,
 )
 from src.db.models.support_listing import LlmResponse, Support
 from src.pipelines.generate_referrals.pipeline_wrapper import ResourceList
@@ -39,6 +42,48 @@ def test_UploadFilesToByteStreams():
     assert byte_streams[1].data == b"Another file."
 
 
+def test_OpenAIWebSearchGenerator_api_params():
+    component = OpenAIWebSearchGenerator()
+
+    single = component._api_params([ChatMessage.from_user("Hi")], None, "gpt-5-mini", "low")
+    assert single["input"] == "Hi"
+    assert "filters" not in single["tools"][0]
+
+    # Multiple messages are kept separate so the leading static message can be prompt-cached
+    multiple = component._api_params(
+        [ChatMessage.from_system("Instructions"), ChatMessage.from_user("Query")],
+        "example.org",
+        "gpt-5-mini",
+        "low",
+    )
+    assert multiple["input"] == [
+        {"role": "system", "content": "Instructions"},
+        {"role": "user", "content": "Query"},
+    ]
+    assert multiple["tools"][0]["filters"] == {"allowed_domains": ["example.org"]}
+
+
+def test_OpenAIWebSearchGenerator_run_async(llm_client):
+    llm_client.replies = ["Answer"] * 4
+    component = OpenAIWebSearchGenerator()
+
+    async def run_twice() -> list[dict]:
+        return [
+            await component.run_async([ChatMessage.from_user("Hi")], model="gpt-5-mini")
+            for _ in range(2)
+        ]
+
+    outputs = asyncio.run(run_twice())
+    assert [output["replies"][0].text for output in outputs] == ["Answer", "Answer"]
+    assert [request["input"] for request in llm_client.requests] == ["Hi", "Hi"]
+    # Requests in the same event loop share a client
+    assert llm_client.created_count == 1
+
+    # A new event loop gets its own client
+    asyncio.run(run_twice())
+    assert llm_client.created_count == 2
+
+
 @pytest.fixture
 def support_records(enable_factory_create, db_session: db.Session):
     db_session.query(Support).delete()
@@ -46,7 +91,9 @@ def support_records(enable_factory_create, db_session: db.Session):
         SupportFactory.create(name="Support A", description="Desc A", website="http://a.com"),
         SupportFactory.create(name="Support B", description="Desc B", website="http://b.com"),
     ]
+    supports_cache.clear()
     yield records
+    supports_cache.clear()
 
     for record in records:
         db_session.delete(record)
@@ -161,6 +208,7 @@ def test_LlmOutputValidator():
     valid_replies_output = component.run(replies=[ChatMessage.from_assistant(text=VALID_JSON_STR)])
     assert "valid_replies" in valid_replies_output
     assert valid_replies_output["valid_replies"][0].text == VALID_JSON_STR
+    assert valid_replies_output["validated_output"] == ResourceList.model_validate(VALID_JSON_OBJ)
     assert "invalid_replies" not in valid_replies_output
     assert "error_message" not in valid_replies_output
 
@@ -0,0 +1,65 @@
+import asyncio
+
+import httpx
+import pytest
+from haystack.dataclasses.chat_message import ChatMessage
+
+from src.common import haystack_utils
+
+
+@pytest.fixture(autouse=True)
+def clear_prompt_cache():
+    haystack_utils.phoenix_prompt_cache.clear()
+    yield
+    haystack_utils.phoenix_prompt_cache.clear()
+
+
+def test_get_cached_phoenix_prompt(monkeypatch):
+    calls = []
+
+    def fake_get_phoenix_prompt(prompt_name: str, prompt_version_id: str = ""):
+        calls.append((prompt_name, prompt_version_id))
+        return [ChatMessage.from_user(f"{prompt_name} {prompt_version_id}")]
+
+    monkeypatch.setattr(haystack_utils, "get_phoenix_prompt", fake_get_phoenix_prompt)
+
+    first = haystack_utils.get_cached_phoenix_prompt("generate_referrals")
+    assert haystack_utils.get_cached_phoenix_prompt("generate_referrals") is first
+    haystack_utils.get_cached_phoenix_prompt("generate_referrals", "version1")
+
+    assert calls == [("generate_referrals", ""), ("generate_referrals", "version1")]
+
+
+def test_get_cached_phoenix_prompt_does_not_cache_errors(monkeypatch):
+    def failing_get_phoenix_prompt(prompt_name: str, prompt_version_id: str = ""):
+        request = httpx.Request("GET", "https://phoenix/v1/prompts")
+        raise httpx.HTTPStatusError(
+            "Not found", request=request, response=httpx.Response(404, request=request)
+        )
+
+    monkeypatch.setattr(haystack_utils, "get_phoenix_prompt", failing_get_phoenix_prompt)
+    with pytest.raises(httpx.HTTPStatusError):
+        haystack_utils.get_cached_phoenix_prompt("generate_referrals", "missing")
+
+    assert len(haystack_utils.phoenix_prompt_cache) == 0
+
+
+def test_run_concurrently():
+    running = 0
+    max_running = 0
+
+    async def fake_run_async(query: str) -> str:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return query
+
+    kwargs_list = [{"query": f"query {i}"} for i in range(5)]
+    results = asyncio.run(
+        haystack_utils.run_concurrently(fake_run_async, kwargs_list, max_concurrency=2)
+    )
+
+    assert results == [f"query {i}" for i in range(5)]
+    assert max_running == 2
@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.common import components
+
+
+class FakeAsyncOpenAI:
+    """Stands in for AsyncOpenAI, returning the queued replies from the Responses API in order"""
+
+    def __init__(self) -> None:
+        self.responses = self
+        self.replies: list[str] = []
+        self.requests: list[dict] = []
+        # Number of times AsyncOpenAI() was called to create a client
+        self.created_count = 0
+
+    async def create(self, **kwargs) -> SimpleNamespace:
+        self.requests.append(kwargs)
+        return SimpleNamespace(output_text=self.replies.pop(0))
+
+
+@pytest.fixture
+def llm_client(monkeypatch) -> FakeAsyncOpenAI:
+    llm_client = FakeAsyncOpenAI()
+
+    def create_client() -> FakeAsyncOpenAI:
+        llm_client.created_count += 1
+        return llm_client
+
+    monkeypatch.setattr(components, "AsyncOpenAI", create_client)
+    return llm_client
@@ -0,0 +1,83 @@
+from typing import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from presidio_analyzer import RecognizerResult
+
+from src.logging import presidio_pii_filter
+from src.logging.presidio_pii_filter import PresidioRedactionSpanExporter
+
+
+class FakeNlpEngineProvider:
+    def __init__(self, nlp_configuration: dict) -> None:
+        pass
+
+    def create_engine(self) -> None:
+        return None
+
+
+class FakeAnalyzerEngine:
+    """Detects a fixed name instead of loading a spaCy model"""
+
+    def __init__(self, nlp_engine: None) -> None:
+        pass
+
+    def analyze(self, text: str, entities: list[str], language: str) -> list[RecognizerResult]:
+        start = text.find("Jane Doe")
+        if start < 0:
+            return []
+        return [RecognizerResult("PERSON", start, start + len("Jane Doe"), 1.0)]
+
+
+class FakeExporter(SpanExporter):
+    def __init__(self) -> None:
+        self.exported: list[ReadableSpan] = []
+        self.flush_timeouts: list[int] = []
+        self.is_shutdown = False
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        self.exported.extend(spans)
+        return SpanExportResult.FAILURE
+
+    def shutdown(self) -> None:
+        self.is_shutdown = True
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        self.flush_timeouts.append(timeout_millis)
+        return False
+
+
+def create_spans() -> list[ReadableSpan]:
+    span_exporter = InMemorySpanExporter()
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    with tracer_provider.get_tracer(__name__).start_as_current_span("query") as span:
+        span.set_attribute("input.value", "Client Jane Doe needs housing")
+        span.add_event("Reply for Jane Doe", {"count": 1})
+    return list(span_exporter.get_finished_spans())
+
+
+def test_export_forwards_redacted_copies(monkeypatch):
+    monkeypatch.setattr(presidio_pii_filter, "NlpEngineProvider", FakeNlpEngineProvider)
+    monkeypatch.setattr(presidio_pii_filter, "AnalyzerEngine", FakeAnalyzerEngine)
+    fake_exporter = FakeExporter()
+    redaction_exporter = PresidioRedactionSpanExporter(fake_exporter)
+    spans = create_spans()
+
+    # The wrapped exporter's result is passed through
+    assert redaction_exporter.export(spans) == SpanExportResult.FAILURE
+
+    [redacted_span] = fake_exporter.exported
+    assert redacted_span is not spans[0]
+    assert redacted_span.context == spans[0].context
+    assert redacted_span.attributes["input.value"] == "Client [REDACTED_PERSON] needs housing"
+    assert redacted_span.events[0].name == "Reply for [REDACTED_PERSON]"
+    assert redacted_span.events[0].attributes == {"count": 1}
+    # The original span is not modified
+    assert spans[0].attributes["input.value"] == "Client Jane Doe needs housing"
+
+    assert redaction_exporter.force_flush(100) is False
+    assert fake_exporter.flush_timeouts == [100]
+    redaction_exporter.shutdown()
+    assert fake_exporter.is_shutdown
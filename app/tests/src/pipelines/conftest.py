@@ -0,0 +1,21 @@
+import pytest
+from openinference.instrumentation import TraceConfig, _tracers
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+
+@pytest.fixture
+def span_exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def oi_tracer(span_exporter) -> _tracers.OITracer:
+    """
+    Tracer to monkeypatch into a pipeline wrapper module in place of the no-op tracer,
+    so that tests can check the exported spans
+    """
+    tracer_provider = TracerProvider()
+    tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+    return _tracers.OITracer(tracer_provider.get_tracer(__name__), config=TraceConfig())
@@ -1,7 +1,16 @@
+import asyncio
+
 import pytest
 
-from src.pipelines.generate_action_plan.pipeline_wrapper import format_resources
+from src.pipelines.generate_action_plan import pipeline_wrapper
+from src.pipelines.generate_action_plan.pipeline_wrapper import (
+    PipelineWrapper,
+    _format_resource_fields,
+    format_resources,
+    get_resources,
+)
 from src.pipelines.generate_referrals.pipeline_wrapper import Resource
+from src.util.cache_util import TtlCache
 
 
 @pytest.fixture
@@ -68,6 +77,14 @@ def test_format_resources(sample_resources):
     assert "Website:" in formatted
 
 
+def test_get_resources(sample_resources):
+    assert get_resources([]) == []
+    assert get_resources(sample_resources) is sample_resources
+
+    resource_dicts = [resource.model_dump() for resource in sample_resources]
+    assert get_resources(resource_dicts) == sample_resources
+
+
 def test_format_resources_empty_list():
     formatted = format_resources([])
     assert formatted == ""
@@ -93,3 +110,58 @@ def test_format_resources_with_missing_fields():
     assert "Name: Minimal Resource" in formatted
     # Should include addresses even if only one
     assert "Addresses: 100 Test St" in formatted
+
+
+def test_format_resources_reuses_cached_text(sample_resources):
+    formatted = format_resources(sample_resources)
+    hits_before = _format_resource_fields.cache_info().hits
+
+    # Equal resources in new objects should be served from the cache
+    copies = [resource.model_copy(deep=True) for resource in sample_resources]
+    assert format_resources(copies) == formatted
+    assert _format_resource_fields.cache_info().hits == hits_before + len(sample_resources)
+
+
+def test_run_api_async_caches_valid_action_plans(
+    monkeypatch, oi_tracer, span_exporter, sample_resources
+):
+    monkeypatch.setattr(pipeline_wrapper, "tracer", oi_tracer)
+    wrapper = PipelineWrapper()
+    wrapper.response_cache = TtlCache(maxsize=8, ttl_seconds=60)
+    valid_plan = '{"title": "Plan", "summary": "Summary", "content": "Content"}'
+    llm_responses = ["not json", valid_plan, "unused"]
+
+    async def fake_run_async(resource_objects, user_email: str, user_query: str) -> dict:
+        return {"response": llm_responses.pop(0)}
+
+    monkeypatch.setattr(wrapper, "_run_async", fake_run_async)
+
+    def run_api(**kwargs) -> dict:
+        return asyncio.run(
+            wrapper.run_api_async(
+                resources=sample_resources,
+                user_email="test@example.com",
+                user_query="Need housing",
+                **kwargs,
+            )
+        )
+
+    # An invalid action plan isn't cached, so retrying the request generates a new one
+    assert run_api() == {"response": "not json"}
+    assert run_api() == {"response": valid_plan}
+    # The valid action plan is returned from the cache
+    assert run_api() == {"response": valid_plan}
+    assert llm_responses == ["unused"]
+    assert [span.attributes["cache_hit"] for span in span_exporter.get_finished_spans()] == [
+        False,
+        False,
+        True,
+    ]
+
+    # cache=False neither reads from nor writes to the cache
+    wrapper.response_cache.clear()
+    llm_responses[:] = [valid_plan, valid_plan]
+    run_api(cache=False)
+    assert len(wrapper.response_cache) == 0
+    run_api(cache=False)
+    assert llm_responses == []
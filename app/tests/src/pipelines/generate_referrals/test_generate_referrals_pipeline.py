@@ -1,7 +1,16 @@
+import asyncio
+import json
+from typing import List
+
 import pytest
+from fastapi import HTTPException
+from haystack.dataclasses.chat_message import ChatMessage
 
 from src.adapters import db
+from src.common import components, haystack_utils
 from src.db.models.support_listing import Support
+from src.pipelines.generate_referrals import pipeline_wrapper
+from src.pipelines.generate_referrals.pipeline_wrapper import PipelineWrapper, response_cache_key
 from tests.src.db.models.factories import SupportFactory, SupportListingFactory
 
 
@@ -12,3 +21,160 @@ def seed_supports(enable_factory_create, db_session: db.Session):
 
     support_listing = SupportListingFactory.create()
     return [SupportFactory.create(support_listing=support_listing) for _ in range(3)]
+
+
+def test_response_cache_key():
+    prompt = [ChatMessage.from_user("{{query}}")]
+    key = response_cache_key("Need food", prompt, "supports1")
+    assert key == response_cache_key("  need FOOD\n", prompt, "supports1")
+    assert key != response_cache_key("need housing", prompt, "supports1")
+    new_prompt = [ChatMessage.from_user("New version: {{query}}")]
+    assert key != response_cache_key("need food", new_prompt, "supports1")
+    assert key != response_cache_key("need food", prompt, "supports2")
+
+
+def test_get_prompt_template_uses_cache_without_thread(monkeypatch):
+    prompt = [ChatMessage.from_user("{{query}}")]
+    haystack_utils.phoenix_prompt_cache.set(("generate_referrals", "version1"), prompt)
+
+    def fail_to_thread(*args, **kwargs):
+        pytest.fail("A cached prompt should be returned without using a thread")
+
+    monkeypatch.setattr(asyncio, "to_thread", fail_to_thread)
+    try:
+        assert asyncio.run(PipelineWrapper()._get_prompt_template("version1")) is prompt
+    finally:
+        haystack_utils.phoenix_prompt_cache.clear()
+
+
+VALID_REPLY = json.dumps(
+    {
+        "resources": [
+            {
+                "name": "Food Bank",
+                "addresses": [],
+                "phones": [],
+                "emails": [],
+                "description": "Food assistance",
+                "justification": "Client needs food",
+            }
+        ]
+    }
+)
+
+
+@pytest.fixture
+def saved_replies(monkeypatch) -> list[str]:
+    saved_replies: list[str] = []
+
+    def fake_save_result(self, replies: List[ChatMessage]) -> dict:
+        saved_replies.append(replies[0].text)
+        return {"result_id": f"result-{len(saved_replies)}"}
+
+    monkeypatch.setattr(components.SaveResult, "run", fake_save_result)
+    return saved_replies
+
+
+@pytest.fixture
+def wrapper(monkeypatch, oi_tracer, llm_client, saved_replies):
+    monkeypatch.setattr(pipeline_wrapper, "tracer", oi_tracer)
+    monkeypatch.setattr(components.LoadSupports, "load_supports", lambda self: ["Name: Food Bank"])
+    monkeypatch.setattr(
+        haystack_utils,
+        "get_cached_phoenix_prompt",
+        lambda prompt_name, prompt_version_id="": [
+            ChatMessage.from_user(
+                prompt_version_id + " {{query}} {{supports}} {{response_json}} {{error_message}}"
+            )
+        ],
+    )
+    components.supports_cache.clear()
+    referrals_wrapper = PipelineWrapper()
+    referrals_wrapper.setup()
+    yield referrals_wrapper
+    components.supports_cache.clear()
+
+
+def test_run_api_async(wrapper, llm_client, saved_replies, span_exporter, monkeypatch):
+    # The first reply is invalid, so the pipeline retries with the error message in the prompt
+    llm_client.replies = ["not json", VALID_REPLY]
+
+    def fail_from_json(*args, **kwargs):
+        pytest.fail("The span output should use the validated output rather than parse the reply")
+
+    monkeypatch.setattr(pipeline_wrapper, "from_json", fail_from_json)
+
+    result = asyncio.run(wrapper.run_api_async("Need food", "test@example.com"))
+
+    assert len(llm_client.requests) == 2
+    assert "Invalid JSON" in llm_client.requests[1]["input"]
+    # The validated output is used internally and not returned by the API
+    assert set(result.keys()) == {"llm", "logger", "save_result"}
+    assert result["llm"]["replies"][0].text == VALID_REPLY
+    assert result["save_result"] == {"result_id": "result-1"}
+    assert saved_replies == [VALID_REPLY]
+
+    [span] = span_exporter.get_finished_spans()
+    assert json.loads(span.attributes["output.value"]) == ["Food Bank"]
+
+
+def test_run_api_async_reuses_cached_response(wrapper, llm_client, saved_replies, span_exporter):
+    llm_client.replies = [VALID_REPLY, VALID_REPLY]
+
+    def run_api(query: str, **kwargs) -> dict:
+        return asyncio.run(wrapper.run_api_async(query, "test@example.com", **kwargs))
+
+    generated = run_api("Need food")
+    # The normalized query is answered from the cache, but the response is saved with a new result_id
+    cached = run_api("  need FOOD ")
+    assert len(llm_client.requests) == 1
+    assert cached.keys() == generated.keys()
+    assert cached["llm"] == generated["llm"]
+    assert cached["logger"]["logs"][0]["query"] == "  need FOOD "
+    assert cached["logger"]["logs"][1:] == generated["logger"]["logs"][1:]
+    assert cached["save_result"] == {"result_id": "result-2"}
+    assert saved_replies == [VALID_REPLY, VALID_REPLY]
+    assert [span.attributes["cache_hit"] for span in span_exporter.get_finished_spans()] == [
+        False,
+        True,
+    ]
+
+    # A different prompt version generates a new response
+    run_api("Need food", prompt_version_id="version1")
+    assert len(llm_client.requests) == 2
+
+
+def test_run_api_async_without_cache(wrapper, llm_client):
+    llm_client.replies = [VALID_REPLY, VALID_REPLY]
+
+    asyncio.run(wrapper.run_api_async("Need food", "test@example.com", cache=False))
+    assert len(wrapper.response_cache) == 0
+    asyncio.run(wrapper.run_api_async("Need food", "test@example.com", cache=False))
+    assert len(llm_client.requests) == 2
+
+
+def test_run_api_async_regenerates_response_after_supports_change(wrapper, llm_client, monkeypatch):
+    llm_client.replies = [VALID_REPLY, VALID_REPLY]
+    asyncio.run(wrapper.run_api_async("Need food", "test@example.com"))
+
+    # E.g., a support was deleted and the supports were reloaded
+    monkeypatch.setattr(components.LoadSupports, "load_supports", lambda self: [])
+    components.supports_cache.clear()
+    asyncio.run(wrapper.run_api_async("Need food", "test@example.com"))
+
+    assert len(llm_client.requests) == 2
+
+
+def test_run_api_async_cache_hit_error(wrapper, llm_client, monkeypatch):
+    llm_client.replies = [VALID_REPLY]
+    asyncio.run(wrapper.run_api_async("Need food", "test@example.com"))
+
+    def failing_save_result(self, replies: List[ChatMessage]) -> dict:
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(components.SaveResult, "run", failing_save_result)
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(wrapper.run_api_async("Need food", "test@example.com"))
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "Internal error: Database unavailable"
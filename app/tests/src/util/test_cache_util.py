@@ -0,0 +1,42 @@
+from src.util import cache_util
+from src.util.cache_util import TtlCache
+
+
+def test_get_and_set():
+    cache: TtlCache[str] = TtlCache(maxsize=2, ttl_seconds=60)
+    assert cache.get("a") is None
+
+    cache.set("a", "value a")
+    assert cache.get("a") == "value a"
+
+    cache.pop("a")
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: TtlCache[int] = TtlCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_entries_expire(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr(cache_util.time, "monotonic", lambda: now)
+
+    cache: TtlCache[int] = TtlCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+
+    now += 59
+    assert cache.get("a") == 1
+
+    now += 1
+    assert cache.get("a") is None
+    assert len(cache) == 0